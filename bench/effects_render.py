@@ -0,0 +1,44 @@
+# ------------------------------------------------------------------------------
+# XMG-KB - RGB Keyboard Controller
+# Version: 2.1.1
+# Author: Gerald Hasani
+# Email: contact@gerald-hasani.com
+# GitHub: https://github.com/Gerald-Ha
+# ------------------------------------------------------------------------------
+
+# Per-frame render cost of the software effects (no keyboard needed).
+#
+#   python bench/effects_render.py [--frames 5000]
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from xmg.core.effects import SOFTWARE_EFFECTS, create_effect  # noqa: E402
+
+BUDGET_MS = 1000.0 / 60
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark software effect rendering')
+    parser.add_argument('--frames', type=int, default=5000, help='Frames per measurement')
+    parser.add_argument('--repeat', type=int, default=5, help='Measurements per effect (best is reported)')
+    args = parser.parse_args()
+
+    setup = min(timeit.repeat(
+        lambda: [create_effect(name) for name in SOFTWARE_EFFECTS], number=1, repeat=args.repeat))
+    print(f"Table setup (all effects): {setup * 1e3:.2f} ms")
+
+    for name in SOFTWARE_EFFECTS:
+        effect = create_effect(name)
+        best = min(timeit.repeat(effect.render, number=args.frames, repeat=args.repeat))
+        per_frame = best / args.frames * 1e3
+        print(f"{name:<8} {per_frame:.4f} ms/frame "
+              f"({per_frame / BUDGET_MS * 100:.2f}% of a 60 FPS frame)")
+
+
+if __name__ == '__main__':
+    main()
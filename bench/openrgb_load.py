@@ -0,0 +1,158 @@
+# ------------------------------------------------------------------------------
+# XMG-KB - RGB Keyboard Controller
+# Version: 2.1.1
+# Author: Gerald Hasani
+# Email: contact@gerald-hasani.com
+# GitHub: https://github.com/Gerald-Ha
+# ------------------------------------------------------------------------------
+
+# Load-generating OpenRGB client for the --serve mode.
+#
+#   python bench/openrgb_load.py                  # in-process server + fake keyboard
+#   python bench/openrgb_load.py --port 6742      # against a running 'xmg-kb --serve'
+#
+# Sends UpdateLEDs as fast as possible (--batch messages per send call) and
+# reports messages sent per second; with the built-in server it also reports
+# the frames the server parsed and pushed to the (fake) keyboard.
+
+import argparse
+import multiprocessing
+import os
+import signal
+import socket
+import struct
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from xmg.core.openrgb import (  # noqa: E402
+    HEADER,
+    LED_COUNT,
+    MAGIC,
+    REQUEST_CONTROLLER_COUNT,
+    REQUEST_CONTROLLER_DATA,
+    REQUEST_PROTOCOL_VERSION,
+    RGBCONTROLLER_UPDATELEDS,
+    OpenRGBServer,
+)
+
+
+class FakeKeyboard:
+    def __init__(self):
+        self.frames = 0
+
+    def set_rows(self, rows, save=0x01):
+        self.frames += 1
+
+
+def _run_server(port, fps, ready, results):
+    server = OpenRGBServer(FakeKeyboard(), port=port, fps=fps)
+    signal.signal(signal.SIGTERM, lambda *_: server.stop())
+    ready.set()
+    results.put(server.serve_forever(out=lambda _: None))
+
+
+def _request(sock, pkt_id, data=b''):
+    sock.sendall(HEADER.pack(MAGIC, 0, pkt_id, len(data)) + data)
+
+
+def _reply(sock):
+    def recv_exact(size):
+        data = b''
+        while len(data) < size:
+            chunk = sock.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError('server closed the connection')
+            data += chunk
+        return data
+
+    _, _, pkt_id, size = HEADER.unpack(recv_exact(HEADER.size))
+    return pkt_id, recv_exact(size)
+
+
+def _connect(port):
+    deadline = time.monotonic() + 5
+    while True:
+        try:
+            return socket.create_connection(('127.0.0.1', port))
+        except ConnectionRefusedError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+def run_client(port, duration, batch):
+    sock = _connect(port)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    _request(sock, REQUEST_PROTOCOL_VERSION, struct.pack('<I', 1))
+    _, version = _reply(sock)
+    _request(sock, REQUEST_CONTROLLER_COUNT)
+    _, count = _reply(sock)
+    _request(sock, REQUEST_CONTROLLER_DATA, struct.pack('<I', 1))
+    _, data = _reply(sock)
+    print(f"Handshake: protocol {struct.unpack('<I', version)[0]}, "
+          f"{struct.unpack('<I', count)[0]} controller(s), {len(data)} bytes controller data")
+
+    frames = [bytes([i, 255 - i, (i * 7) & 0xFF, 0]) * LED_COUNT for i in range(256)]
+    messages = []
+    for colors in frames:
+        body = struct.pack('<IH', 6 + len(colors), LED_COUNT) + colors
+        messages.append(HEADER.pack(MAGIC, 0, RGBCONTROLLER_UPDATELEDS, len(body)) + body)
+    chunks = [
+        (b''.join(messages[i:i + batch]), len(messages[i:i + batch]))
+        for i in range(0, len(messages), batch)
+    ]
+
+    sent = 0
+    i = 0
+    start = time.monotonic()
+    end = start + duration
+    while time.monotonic() < end:
+        chunk, count = chunks[i]
+        sock.sendall(chunk)
+        i = (i + 1) % len(chunks)
+        sent += count
+    # The reply only arrives once the server has parsed everything sent before it
+    _request(sock, REQUEST_CONTROLLER_COUNT)
+    _reply(sock)
+    elapsed = time.monotonic() - start
+    sock.close()
+    return sent, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='OpenRGB load generator for xmg-kb --serve')
+    parser.add_argument('--port', type=int, help='Use a running server instead of starting one')
+    parser.add_argument('--duration', type=float, default=3.0, help='Seconds to send (default 3)')
+    parser.add_argument('--batch', type=int, default=1, help='UpdateLEDs messages per send call')
+    parser.add_argument('--fps', type=int, default=60, help='Tick rate of the built-in server')
+    args = parser.parse_args()
+
+    server = None
+    port = args.port
+    if port is None:
+        with socket.socket() as probe:
+            probe.bind(('127.0.0.1', 0))
+            port = probe.getsockname()[1]
+        ready = multiprocessing.Event()
+        results = multiprocessing.Queue()
+        server = multiprocessing.Process(target=_run_server, args=(port, args.fps, ready, results))
+        server.start()
+        ready.wait()
+
+    sent, elapsed = run_client(port, args.duration, max(1, args.batch))
+    print(f"Client sent: {sent} UpdateLEDs in {elapsed:.2f} s ({sent / elapsed:.0f} msg/s, "
+          f"batch {args.batch})")
+
+    if server:
+        os.kill(server.pid, signal.SIGTERM)
+        received, pushed = results.get(timeout=10)
+        server.join()
+        print(f"Server parsed: {received} frames ({received / elapsed:.0f} fps)")
+        print(f"Server pushed: {pushed} frames ({pushed / elapsed:.1f} fps)")
+
+
+if __name__ == '__main__':
+    main()
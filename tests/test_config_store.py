@@ -0,0 +1,164 @@
+import json
+import multiprocessing
+import os
+import random
+import threading
+
+import pytest
+
+from xmg.core.config import ConfigStore, normalize_config
+
+WORKERS = 12
+ROUNDS = 30
+
+
+class FakeKeyboard:
+    # Records every device call as one line so call order across processes
+    # can be checked afterwards.
+    def __init__(self, log_path):
+        self._log_path = log_path
+
+    def _record(self, *fields):
+        line = ' '.join(str(f) for f in (os.getpid(),) + fields) + '\n'
+        fd = os.open(self._log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT)
+        try:
+            os.write(fd, line.encode())
+        finally:
+            os.close(fd)
+
+    def apply(self, config, source):
+        self._record('begin', source, config['color'])
+        for _ in range(8):
+            self._record('write', source, config['color'])
+        self._record('end', source, config['color'])
+
+
+def _worker(config_dir, log_path, seed):
+    random.seed(seed)
+    store = ConfigStore(config_dir)
+    keyboard = FakeKeyboard(log_path)
+
+    for i in range(ROUNDS):
+        if random.random() < 0.5:
+            config = {'mode': 'color', 'color': f'{seed}-{i}', 'brightness': 4}
+            with store.device_lock():
+                keyboard.apply(config, 'save')
+                store.save(config)
+        else:
+            with store.device_lock(blocking=False) as acquired:
+                if not acquired:
+                    continue
+                config = store.load()
+                if config:
+                    keyboard.apply(config, 'restore')
+
+
+def test_concurrent_writers_and_restores(tmp_path):
+    config_dir = str(tmp_path)
+    log_path = str(tmp_path / 'device.log')
+
+    processes = [
+        multiprocessing.Process(target=_worker, args=(config_dir, log_path, seed))
+        for seed in range(WORKERS)
+    ]
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join(timeout=60)
+    assert all(p.exitcode == 0 for p in processes)
+
+    with open(log_path) as f:
+        calls = [line.split() for line in f]
+    assert calls
+
+    # Every apply must run start to finish without another process in between,
+    # and a restore must never bring back a config older than the last save.
+    saved = None
+    restores = 0
+    for start in range(0, len(calls), 10):
+        block = calls[start:start + 10]
+        pid, _, source, color = block[0]
+        assert [c[1] for c in block] == ['begin'] + ['write'] * 8 + ['end']
+        assert all(c[0] == pid and c[2] == source and c[3] == color for c in block)
+        if source == 'save':
+            saved = color
+        else:
+            assert color == saved
+            restores += 1
+    assert restores
+
+    assert ConfigStore(config_dir).load()['color'] == saved
+    assert not [n for n in os.listdir(config_dir) if n.endswith('.tmp')]
+
+
+def test_load_caches_until_file_changes(tmp_path, monkeypatch):
+    store = ConfigStore(str(tmp_path))
+    store.save({'mode': 'color', 'color': 'red'})
+
+    def fail(_):
+        raise AssertionError('config re-parsed')
+
+    monkeypatch.setattr(json, 'load', fail)
+    assert store.load() == {'mode': 'color', 'color': 'red'}
+    monkeypatch.undo()
+
+    with open(store.path, 'w') as f:
+        json.dump({'mode': 'off'}, f)
+    assert store.load() == {'mode': 'off'}
+
+
+def test_load_returns_copy(tmp_path):
+    store = ConfigStore(str(tmp_path))
+    store.save({'mode': 'h_alt', 'colors': ['red', 'blue']})
+    store.load()['colors'].append('green')
+    assert store.load()['colors'] == ['red', 'blue']
+
+
+def test_load_missing_file(tmp_path):
+    assert ConfigStore(str(tmp_path)).load() is None
+
+
+def test_non_blocking_lock_reports_busy(tmp_path):
+    store = ConfigStore(str(tmp_path))
+    with store.device_lock():
+        with ConfigStore(str(tmp_path)).device_lock(blocking=False) as acquired:
+            assert not acquired
+    with store.device_lock(blocking=False) as acquired:
+        assert acquired
+
+
+def test_busy_lock_reports_before_waiting(tmp_path):
+    holder = ConfigStore(str(tmp_path))
+    waiting = threading.Event()
+    acquired = []
+
+    def worker():
+        with ConfigStore(str(tmp_path)).device_lock(on_wait=waiting.set) as ok:
+            acquired.append(ok)
+
+    with holder.device_lock():
+        thread = threading.Thread(target=worker)
+        thread.start()
+        assert waiting.wait(timeout=5)
+        assert not acquired
+    thread.join(timeout=5)
+    assert acquired == [True]
+
+
+def test_free_lock_does_not_report_waiting(tmp_path):
+    calls = []
+    with ConfigStore(str(tmp_path)).device_lock(on_wait=lambda: calls.append(1)) as ok:
+        assert ok
+    assert not calls
+
+
+@pytest.mark.parametrize('legacy, expected', [
+    ({'mode': 'h-alt', 'color_a': 'pink', 'color_b': 'cyan'},
+     {'mode': 'h_alt', 'colors': ['pink', 'cyan']}),
+    ({'mode': 'v-alt', 'color_a': 'red', 'color_b': 'blue', 'brightness': 2},
+     {'mode': 'v_alt', 'colors': ['red', 'blue'], 'brightness': 2}),
+    ({'mode': 'h_alt', 'colors': ['red', 'blue']},
+     {'mode': 'h_alt', 'colors': ['red', 'blue']}),
+])
+def test_normalize_config(legacy, expected):
+    assert normalize_config(legacy) == expected
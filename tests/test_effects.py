@@ -0,0 +1,72 @@
+import pytest
+
+from xmg.core.colors import COLORS
+from xmg.core.effects import (
+    LUT_SIZE,
+    MASK,
+    SOFTWARE_EFFECTS,
+    create_effect,
+    intensity_palette,
+    phase_offsets,
+)
+from xmg.core.geometry import KEY_POSITIONS, distance_field, projection_field
+from xmg.core.patterns import FRAME_BYTES, KEY_COLS, KEY_ROWS
+
+
+def test_key_positions_cover_grid():
+    assert len(KEY_POSITIONS) == KEY_ROWS * KEY_COLS
+
+
+def test_distance_field_is_zero_at_origin():
+    origin = KEY_POSITIONS[20]
+    field = distance_field(origin)
+    assert field[20] == 0
+    assert min(field) == 0
+
+
+def test_projection_field_follows_x():
+    field = projection_field(0.0)
+    assert field[1] - field[0] == pytest.approx(1.0)
+
+
+def test_phase_offsets_wrap():
+    assert phase_offsets([0.0, 1.0, 4.0], 4.0) == (0, LUT_SIZE // 4, 0)
+
+
+@pytest.mark.parametrize('name', sorted(SOFTWARE_EFFECTS))
+def test_render_produces_full_frame(name):
+    effect = create_effect(name)
+    first = effect.render()
+    assert len(first) == FRAME_BYTES
+    assert all(first[i] == 0 for i in range(0, FRAME_BYTES, 4))
+    assert effect.render() != first
+
+
+def test_palette_uses_color_channels():
+    palette = intensity_palette('red')
+    peak = max(palette, key=lambda cell: cell[1])
+    assert peak == bytes(COLORS['red'])
+
+
+@pytest.mark.parametrize('color', ['nope', 'h-pink-cyan', 'v-red-blue'])
+def test_invalid_color_rejected(color):
+    with pytest.raises(ValueError):
+        create_effect('wave', color=color)
+
+
+def test_unknown_effect_rejected():
+    with pytest.raises(ValueError):
+        create_effect('fireworks')
+
+
+@pytest.mark.parametrize('speed', [1, 5, 10])
+def test_aurora_phases_advance_steadily_across_wrap(speed):
+    effect = create_effect('aurora', speed=speed)
+    steps_a, steps_b = set(), set()
+    for _ in range(2 * LUT_SIZE):
+        a, b = effect.phase, effect.phase_b
+        effect.render()
+        steps_a.add((effect.phase - a) & MASK)
+        steps_b.add((effect.phase_b - b) & MASK)
+    assert steps_a == {effect.step}
+    assert steps_b == {effect.step_b}
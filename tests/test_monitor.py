@@ -0,0 +1,114 @@
+import os
+import shutil
+
+import pytest
+
+from xmg.core.colors import COLORS
+from xmg.core.monitor import (
+    BAR_CELLS,
+    CPU_ROWS,
+    LOAD_ROWS,
+    TEMP_ROWS,
+    SystemMonitor,
+    frame_key,
+    parse_cpu_times,
+    render_frame,
+)
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+@pytest.fixture
+def root(tmp_path):
+    shutil.copytree(os.path.join(FIXTURES, 'proc'), tmp_path / 'proc')
+    shutil.copytree(os.path.join(FIXTURES, 'sys'), tmp_path / 'sys')
+    return tmp_path
+
+
+def _write_stat(root, user, idle):
+    (root / 'proc' / 'stat').write_text(
+        f"cpu  {user} 0 500 {idle} 500 0 0 0 0 0\nintr 0\n"
+    )
+
+
+def test_parse_cpu_times():
+    total, idle = parse_cpu_times(b"cpu  100 0 50 800 50 0 0 0 0 0\ncpu0 1 2 3 4\n")
+    assert total == 1000
+    assert idle == 850
+
+
+def test_parse_cpu_times_without_iowait():
+    assert parse_cpu_times(b"cpu  10 0 10 80\n") == (100, 80)
+
+
+def test_sample_reads_fixtures(root):
+    monitor = SystemMonitor(root=str(root))
+    try:
+        cpu, load, temp = monitor.sample()
+        assert cpu == 0.0
+        assert load == pytest.approx(2.0 / (os.cpu_count() or 1))
+        assert temp == 72.0
+    finally:
+        monitor.close()
+
+
+def test_sample_cpu_delta(root):
+    monitor = SystemMonitor(root=str(root))
+    try:
+        monitor.sample()
+        # 300 busy + 100 idle jiffies since the first sample
+        _write_stat(root, 1300, 8100)
+        cpu, _, _ = monitor.sample()
+        assert cpu == pytest.approx(0.75)
+    finally:
+        monitor.close()
+
+
+def test_bad_thermal_zone_is_skipped(root):
+    zone = root / 'sys' / 'class' / 'thermal' / 'thermal_zone0' / 'temp'
+    monitor = SystemMonitor(root=str(root))
+    try:
+        zone.write_text('')
+        _, _, temp = monitor.sample()
+        assert temp == 45.0
+    finally:
+        monitor.close()
+
+
+def test_no_thermal_zones(root):
+    shutil.rmtree(root / 'sys')
+    monitor = SystemMonitor(root=str(root))
+    try:
+        assert monitor.sample()[2] is None
+    finally:
+        monitor.close()
+
+
+def test_frame_key():
+    assert frame_key(0.5, 0.25, 40.0) == (8, 4, 'green')
+    assert frame_key(1.7, -1.0, 90.0) == (BAR_CELLS, 0, 'red')
+    assert frame_key(0.0, 0.0, None) == (0, 0, None)
+
+
+def test_frame_key_ignores_small_changes():
+    assert frame_key(0.50, 0.25, 70.0) == frame_key(0.51, 0.26, 71.0)
+
+
+def test_render_frame():
+    rows = render_frame((4, 16, 'orange'))
+    assert len(rows) == 8
+    assert all(len(row) == BAR_CELLS * 4 for row in rows)
+
+    off = bytes(4)
+    for i in CPU_ROWS:
+        assert rows[i][:16] == bytes(COLORS['cyan']) * 4
+        assert rows[i][16:] == off * 12
+    for i in LOAD_ROWS:
+        assert rows[i] == bytes(COLORS['magenta']) * 16
+    for i in TEMP_ROWS:
+        assert rows[i] == bytes(COLORS['orange']) * 16
+
+
+def test_render_frame_without_temperature():
+    rows = render_frame((0, 0, None))
+    assert all(row == bytes(BAR_CELLS * 4) for row in rows)
@@ -0,0 +1,142 @@
+import selectors
+import socket
+import struct
+
+import pytest
+
+from xmg.core.openrgb import (
+    HEADER,
+    LED_COUNT,
+    MAGIC,
+    MAX_PACKET,
+    REQUEST_CONTROLLER_DATA,
+    RGBCONTROLLER_UPDATELEDS,
+    RGBCONTROLLER_UPDATESINGLELED,
+    Client,
+    FrameBuffer,
+    OpenRGBServer,
+    build_controller_data,
+)
+
+
+class FakeKeyboard:
+    def __init__(self):
+        self.calls = []
+
+    def set_rows(self, rows, save=0x01):
+        self.calls.append((b''.join(rows), save))
+
+
+def _packet(pkt_id, data=b'', dev_idx=0):
+    return HEADER.pack(MAGIC, dev_idx, pkt_id, len(data)) + data
+
+
+def _update_leds(colors, dev_idx=0):
+    body = struct.pack('<IH', 6 + len(colors), len(colors) // 4) + colors
+    return _packet(RGBCONTROLLER_UPDATELEDS, body, dev_idx)
+
+
+@pytest.fixture
+def connection():
+    server = OpenRGBServer(FakeKeyboard())
+    ours, theirs = socket.socketpair()
+    ours.setblocking(False)
+    client = Client(ours)
+    server._selector.register(ours, selectors.EVENT_READ, client)
+    yield server, client, theirs
+    theirs.close()
+    server.close()
+
+
+def test_frame_buffer_shifts_to_device_order():
+    frames = FrameBuffer()
+    frames.update(bytes([1, 2, 3, 0xAA, 4, 5, 6, 0xBB]))
+    assert frames.frame[:8] == bytes([0, 1, 2, 3, 0, 4, 5, 6])
+    assert frames.dirty
+
+
+def test_frame_buffer_clamps_to_led_count():
+    frames = FrameBuffer()
+    frames.update(bytes([9, 9, 9, 0]) * (LED_COUNT + 10))
+    assert frames.frame == bytes([0, 9, 9, 9]) * LED_COUNT
+
+
+def test_fragmented_and_back_to_back_updates(connection):
+    server, client, theirs = connection
+    first = _update_leds(bytes([1, 1, 1, 0]) * LED_COUNT)
+    second = _update_leds(bytes([2, 3, 4, 0]) * LED_COUNT)
+    stream = first + second
+
+    theirs.sendall(stream[:10])
+    server._read(client)
+    assert server.frames.received == 0
+
+    theirs.sendall(stream[10:])
+    while server.frames.received < 2:
+        server._read(client)
+    assert client.buffer == b''
+    assert server.frames.frame == bytes([0, 2, 3, 4]) * LED_COUNT
+
+
+def test_single_led_update(connection):
+    server, client, theirs = connection
+    theirs.sendall(_packet(RGBCONTROLLER_UPDATESINGLELED, struct.pack('<i', 5) + bytes([7, 8, 9, 0])))
+    server._read(client)
+    assert server.frames.frame[20:24] == bytes([0, 7, 8, 9])
+
+
+def test_push_coalesces_to_latest_frame(connection):
+    server, client, theirs = connection
+    for value in (1, 2, 3):
+        theirs.sendall(_update_leds(bytes([value, 0, 0, 0]) * LED_COUNT))
+    while server.frames.received < 3:
+        server._read(client)
+
+    server._push()
+    server._push()
+    assert len(server._keyboard.calls) == 1
+    frame, save = server._keyboard.calls[0]
+    assert frame[:4] == bytes([0, 3, 0, 0])
+    assert save == 0x00
+
+
+def test_reply_is_queued_for_slow_reader(connection):
+    server, client, theirs = connection
+    client.sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 1024)
+    theirs.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1024)
+    expected = _packet(REQUEST_CONTROLLER_DATA, build_controller_data(1)) * 4
+
+    theirs.sendall(_packet(REQUEST_CONTROLLER_DATA, struct.pack('<I', 1)) * 4)
+    server._read(client)
+    assert not client.closed
+    assert client.outgoing
+    assert client.events & selectors.EVENT_WRITE
+
+    received = b''
+    theirs.settimeout(1)
+    while len(received) < len(expected):
+        received += theirs.recv(65536)
+        server._flush(client)
+    assert received == expected
+    assert client.events == selectors.EVENT_READ
+
+
+def test_oversized_packet_drops_client(connection):
+    server, client, theirs = connection
+    theirs.sendall(HEADER.pack(MAGIC, 0, RGBCONTROLLER_UPDATELEDS, 0xFFFFFFF0) + bytes(64))
+    server._read(client)
+    assert client.closed
+    assert server.frames.received == 0
+
+
+def test_largest_valid_update_fits_limit():
+    assert len(_update_leds(bytes(LED_COUNT * 4))) - HEADER.size <= MAX_PACKET
+
+
+def test_update_for_unknown_device_is_ignored(connection):
+    server, client, theirs = connection
+    theirs.sendall(_update_leds(bytes([1, 2, 3, 0]) * LED_COUNT, dev_idx=1))
+    server._read(client)
+    assert not client.closed
+    assert server.frames.received == 0
+    assert not server.frames.dirty
@@ -0,0 +1,95 @@
+import os
+
+import pytest
+
+from xmg.core import patterns
+from xmg.core.colors import get_h_alt_color_vector, get_v_alt_color_vector
+from xmg.core.patterns import (
+    CACHE_MAGIC,
+    FRAME_BYTES,
+    ROW_BYTES,
+    PatternCache,
+    compile_pattern,
+    normalize_pattern,
+)
+
+
+def test_stripes_and_split_match_alt_vectors():
+    stripes = compile_pattern('stripes:pink,cyan')
+    split = compile_pattern('split:red,blue')
+    assert stripes == bytes(get_h_alt_color_vector('pink', 'cyan')) * 8
+    assert split == bytes(get_v_alt_color_vector('red', 'blue')) * 8
+
+
+def test_normalize_pattern():
+    assert normalize_pattern(' Gradient: Red , Blue + fill:white@2:0-3 ') == \
+        'gradient:red,blue+fill:white@2:0-3'
+    assert normalize_pattern('h-pink-cyan') == 'cols:pink,cyan'
+
+
+def test_stripes_is_alias_for_cols():
+    assert normalize_pattern('stripes:red,blue') == 'cols:red,blue'
+    assert compile_pattern('stripes:red,blue') == compile_pattern('cols:red,blue')
+
+
+def test_fill_layer():
+    frame = compile_pattern('solid:blue+fill:#ff0000@1:2-3')
+    row = frame[ROW_BYTES:2 * ROW_BYTES]
+    assert row[8:16] == bytes([0, 0xFF, 0, 0]) * 2
+    assert row[:4] == bytes([0, 0, 0, 0xFF])
+
+
+@pytest.mark.parametrize('pattern', [
+    'rows:red,,blue',
+    'solid:nope',
+    'solid:h-pink-cyan',
+    'fill:red@9:0',
+    'fill:red',
+    'spiral:red',
+    'solid',
+])
+def test_invalid_patterns(pattern):
+    with pytest.raises(ValueError):
+        compile_pattern(pattern)
+
+
+def test_cache_reuses_disk_payload(tmp_path, monkeypatch):
+    PatternCache(str(tmp_path)).get('vgradient:red,blue')
+
+    def fail(_):
+        raise AssertionError('pattern recompiled')
+
+    monkeypatch.setattr(patterns, 'compile_pattern', fail)
+    payload = PatternCache(str(tmp_path)).get('vgradient: RED,blue')
+    assert len(payload) == FRAME_BYTES
+    files = [n for n in os.listdir(tmp_path) if n.endswith('.bin')]
+    assert len(files) == 1
+    with open(tmp_path / files[0], 'rb') as f:
+        assert f.read(len(CACHE_MAGIC)) == CACHE_MAGIC
+
+
+def test_cache_key_changes_with_colors(tmp_path, monkeypatch):
+    PatternCache(str(tmp_path)).get('solid:red')
+    monkeypatch.setitem(patterns.COLORS, 'red', [0x00, 0x80, 0x00, 0x00])
+    payload = PatternCache(str(tmp_path)).get('solid:red')
+    assert payload[:4] == bytes([0x00, 0x80, 0x00, 0x00])
+
+
+def test_cache_ignores_stale_format(tmp_path):
+    cache = PatternCache(str(tmp_path))
+    cache.get('solid:red')
+    for name in os.listdir(tmp_path):
+        with open(tmp_path / name, 'wb') as f:
+            f.write(bytes(FRAME_BYTES))
+    assert PatternCache(str(tmp_path)).get('solid:red') == compile_pattern('solid:red')
+
+
+def test_cache_prunes_oldest_files(tmp_path):
+    cache = PatternCache(str(tmp_path), max_files=3)
+    colors = ['red', 'green', 'blue', 'white', 'cyan']
+    for i, color in enumerate(colors):
+        cache.get(f'solid:{color}')
+        stamp = 1_000_000 + i
+        os.utime(cache._path(f'solid:{color}'), (stamp, stamp))
+    names = sorted(os.listdir(tmp_path))
+    assert names == sorted(os.path.basename(cache._path(f'solid:{c}')) for c in colors[-3:])
@@ -40,3 +40,8 @@ def get_h_alt_color_vector(color_a, color_b):
 
 def get_v_alt_color_vector(color_a, color_b):
     return bytearray(8 * COLORS[color_a] + 8 * COLORS[color_b])
+
+
+def get_bar_color_vector(color_a, filled, color_b=None):
+    off = COLORS[color_b] if color_b else [0x00, 0x00, 0x00, 0x00]
+    return bytearray(filled * COLORS[color_a] + (16 - filled) * off)
@@ -0,0 +1,93 @@
+# ------------------------------------------------------------------------------
+# XMG-KB - RGB Keyboard Controller
+# Version: 2.1.1
+# Author: Gerald Hasani
+# Email: contact@gerald-hasani.com
+# GitHub: https://github.com/Gerald-Ha
+# ------------------------------------------------------------------------------
+
+import copy
+import fcntl
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+
+class ConfigStore:
+    def __init__(self, config_dir, filename='config.json', lock_name='device.lock'):
+        self.config_dir = config_dir
+        self.path = os.path.join(config_dir, filename)
+        self.lock_path = os.path.join(config_dir, lock_name)
+        self._cached = None
+        self._cached_stat = None
+
+    @staticmethod
+    def _stat_key(st):
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def load(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            self._cached = self._cached_stat = None
+            return None
+
+        if self._cached_stat != self._stat_key(st):
+            with open(self.path, 'r') as f:
+                self._cached = json.load(f)
+                self._cached_stat = self._stat_key(os.fstat(f.fileno()))
+        return copy.deepcopy(self._cached)
+
+    def save(self, config):
+        os.makedirs(self.config_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.config_dir, prefix='.config.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(config, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        self._cached = copy.deepcopy(config)
+        self._cached_stat = self._stat_key(os.stat(self.path))
+
+    @contextmanager
+    def device_lock(self, blocking=True, on_wait=None):
+        os.makedirs(self.config_dir, exist_ok=True)
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                if not blocking:
+                    yield False
+                    return
+                if on_wait:
+                    on_wait()
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            yield True
+        finally:
+            os.close(fd)
+
+
+def normalize_config(config):
+    if not config:
+        return config
+    config = dict(config)
+    mode = config.get('mode', 'color')
+
+    # Older menu versions saved 'h-alt' / 'v-alt' with color_a / color_b
+    if mode in ('h-alt', 'v-alt'):
+        config['mode'] = mode.replace('-', '_')
+        mode = config['mode']
+    if mode in ('h_alt', 'v_alt') and 'colors' not in config:
+        config['colors'] = [config.pop('color_a', 'red'), config.pop('color_b', 'blue')]
+    return config
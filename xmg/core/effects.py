@@ -0,0 +1,172 @@
+# ------------------------------------------------------------------------------
+# XMG-KB - RGB Keyboard Controller
+# Version: 2.1.1
+# Author: Gerald Hasani
+# Email: contact@gerald-hasani.com
+# GitHub: https://github.com/Gerald-Ha
+# ------------------------------------------------------------------------------
+
+# Software versions of ripple, wave and aurora. Everything that depends on
+# key positions is turned into per-key phase offsets up front, so a frame is
+# just "palette[(offset + phase) & MASK]" for every key.
+
+import colorsys
+import math
+import time
+
+from xmg.core.colors import COLORS
+from xmg.core.geometry import CENTER, WIDTH, distance_field, projection_field
+from xmg.core.patterns import PRESET_PATTERNS, ROW_BYTES, FRAME_BYTES
+
+LUT_SIZE = 256
+MASK = LUT_SIZE - 1
+DEFAULT_FPS = 60
+
+SINE_LUT = tuple(0.5 + 0.5 * math.sin(2 * math.pi * i / LUT_SIZE) for i in range(LUT_SIZE))
+
+
+def _cell(rgb):
+    return bytes((0x00,) + tuple(max(0, min(255, int(round(v)))) for v in rgb))
+
+
+def intensity_palette(color, floor=0.0, sharpness=1):
+    r, g, b = COLORS[color][1:]
+    return tuple(
+        _cell((r * v, g * v, b * v))
+        for v in (floor + (1.0 - floor) * s ** sharpness for s in SINE_LUT)
+    )
+
+
+def rainbow_palette():
+    return tuple(
+        _cell(c * 255 for c in colorsys.hsv_to_rgb(i / LUT_SIZE, 1.0, 1.0))
+        for i in range(LUT_SIZE)
+    )
+
+
+def aurora_palette(color_a, color_b):
+    a = COLORS[color_a][1:]
+    b = COLORS[color_b][1:]
+    return tuple(
+        _cell(tuple((a[c] + (b[c] - a[c]) * s) * (0.25 + 0.75 * s) for c in range(3)))
+        for s in SINE_LUT
+    )
+
+
+def phase_offsets(field, wavelength):
+    scale = LUT_SIZE / wavelength
+    return tuple(int(round(d * scale)) & MASK for d in field)
+
+
+class SoftwareEffect:
+    def __init__(self, palette, offsets, step):
+        self.palette = palette
+        self.offsets = offsets
+        self.step = step
+        self.phase = 0
+
+    def render(self):
+        palette = self.palette
+        phase = self.phase
+        frame = b''.join([palette[(o - phase) & MASK] for o in self.offsets])
+        self.phase = (phase + self.step) & MASK
+        return frame
+
+
+class AuroraEffect(SoftwareEffect):
+    def __init__(self, palette, offsets, offsets_b, step):
+        super().__init__(palette, offsets, step)
+        self.offsets_b = offsets_b
+        # Second wave runs 1.5x faster in its own accumulator so it doesn't
+        # jump when the first phase wraps
+        self.phase_b = 0
+        self.step_b = (3 * step) >> 1
+        # Sum of two sines mapped back onto the palette index range
+        self._mix = tuple(int((SINE_LUT[i] * 0.5) * LUT_SIZE) & MASK for i in range(LUT_SIZE))
+
+    def render(self):
+        palette = self.palette
+        mix = self._mix
+        p1 = self.phase
+        p2 = self.phase_b
+        frame = b''.join([
+            palette[(mix[(a + p1) & MASK] + mix[(b - p2) & MASK]) & MASK]
+            for a, b in zip(self.offsets, self.offsets_b)
+        ])
+        self.phase = (p1 + self.step) & MASK
+        self.phase_b = (p2 + self.step_b) & MASK
+        return frame
+
+
+def _step(speed):
+    return max(1, 11 - speed)
+
+
+def make_ripple(color='cyan', speed=5, origin=CENTER, wavelength=4.0):
+    palette = intensity_palette(color, sharpness=3)
+    return SoftwareEffect(palette, phase_offsets(distance_field(origin), wavelength), _step(speed))
+
+
+def make_wave(color=None, speed=5, angle=0.0, wavelength=None):
+    palette = intensity_palette(color) if color else rainbow_palette()
+    field = projection_field(angle)
+    return SoftwareEffect(palette, phase_offsets(field, wavelength or WIDTH + 1), _step(speed))
+
+
+def make_aurora(color='green', speed=5, color_b='violet'):
+    palette = aurora_palette(color, color_b)
+    offsets = phase_offsets(projection_field(0.3), 10.0)
+    offsets_b = phase_offsets(projection_field(2.2), 6.0)
+    return AuroraEffect(palette, offsets, offsets_b, _step(speed))
+
+
+SOFTWARE_EFFECTS = {
+    'ripple': make_ripple,
+    'wave':   make_wave,
+    'aurora': make_aurora,
+}
+
+
+def create_effect(name, color=None, speed=5):
+    if name not in SOFTWARE_EFFECTS:
+        raise ValueError(f"Unknown software effect: {name}")
+    if color and (color not in COLORS or color in PRESET_PATTERNS):
+        raise ValueError(f"Unknown color for software effect: {color}")
+    if color:
+        return SOFTWARE_EFFECTS[name](color=color, speed=speed)
+    return SOFTWARE_EFFECTS[name](speed=speed)
+
+
+def run_effect(keyboard, effect, fps=DEFAULT_FPS, out=print):
+    interval = 1.0 / fps
+    frames = 0
+    render_time = 0.0
+    start = time.monotonic()
+    next_tick = start
+
+    try:
+        while True:
+            t0 = time.perf_counter()
+            frame = effect.render()
+            render_time += time.perf_counter() - t0
+            frames += 1
+
+            keyboard.set_rows(
+                [frame[i:i + ROW_BYTES] for i in range(0, FRAME_BYTES, ROW_BYTES)],
+                save=0x00
+            )
+
+            next_tick += interval
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.monotonic()
+    except KeyboardInterrupt:
+        pass
+
+    elapsed = time.monotonic() - start
+    if frames:
+        out(f"Frames: {frames} ({frames / elapsed:.1f} fps)")
+        out(f"Avg render time: {render_time / frames * 1e3:.3f} ms")
+    return frames, render_time
@@ -0,0 +1,38 @@
+# ------------------------------------------------------------------------------
+# XMG-KB - RGB Keyboard Controller
+# Version: 2.1.1
+# Author: Gerald Hasani
+# Email: contact@gerald-hasani.com
+# GitHub: https://github.com/Gerald-Ha
+# ------------------------------------------------------------------------------
+
+import math
+
+from xmg.core.patterns import KEY_ROWS, KEY_COLS
+
+# Approximation, not a measured layout: the controller's key-to-LED mapping
+# isn't known here, so each LED of the 8x16 grid is placed on a 1-unit pitch
+# with a guessed per-row stagger (in key widths) loosely following a laptop
+# keyboard. Good enough for distance-based effects; not per-key accurate.
+ROW_OFFSETS = (0.0, 0.0, 0.5, 0.75, 1.25, 0.0, 0.0, 0.0)
+ROW_PITCH = 1.0
+
+KEY_POSITIONS = tuple(
+    (c + ROW_OFFSETS[r], r * ROW_PITCH)
+    for r in range(KEY_ROWS)
+    for c in range(KEY_COLS)
+)
+
+WIDTH = max(x for x, _ in KEY_POSITIONS)
+HEIGHT = max(y for _, y in KEY_POSITIONS)
+CENTER = (WIDTH / 2, HEIGHT / 2)
+
+
+def distance_field(origin=CENTER):
+    ox, oy = origin
+    return tuple(math.hypot(x - ox, y - oy) for x, y in KEY_POSITIONS)
+
+
+def projection_field(angle=0.0):
+    dx, dy = math.cos(angle), math.sin(angle)
+    return tuple(x * dx + y * dy for x, y in KEY_POSITIONS)
@@ -0,0 +1,181 @@
+# ------------------------------------------------------------------------------
+# XMG-KB - RGB Keyboard Controller
+# Version: 2.1.1
+# Author: Gerald Hasani
+# Email: contact@gerald-hasani.com
+# GitHub: https://github.com/Gerald-Ha
+# ------------------------------------------------------------------------------
+
+import os
+import time
+
+from xmg.core.colors import get_bar_color_vector, get_mono_color_vector
+
+SAMPLE_RATE = 10
+BAR_CELLS = 16
+
+CPU_ROWS = (0, 1, 2)
+LOAD_ROWS = (3, 4)
+TEMP_ROWS = (5, 6, 7)
+
+CPU_COLOR = 'cyan'
+LOAD_COLOR = 'magenta'
+
+# (upper bound in °C, color) - first match wins
+TEMP_COLORS = (
+    (50, 'green'),
+    (65, 'yellow'),
+    (80, 'orange'),
+    (None, 'red'),
+)
+
+
+class ProcFile:
+    def __init__(self, path, size=4096):
+        self._fd = os.open(path, os.O_RDONLY)
+        self._size = size
+
+    def read(self):
+        return os.pread(self._fd, self._size, 0)
+
+    def close(self):
+        os.close(self._fd)
+
+
+def parse_cpu_times(data):
+    fields = data[:data.index(b'\n')].split()[1:]
+    times = [int(v) for v in fields]
+    idle = times[3] + (times[4] if len(times) > 4 else 0)
+    return sum(times), idle
+
+
+def parse_loadavg(data):
+    return float(data[:data.index(b' ')])
+
+
+def parse_temp(data):
+    return int(data) / 1000.0
+
+
+def read_temp(zone):
+    # Zones can be empty or fail with EIO/ENODATA (e.g. iwlwifi with the radio off)
+    try:
+        return parse_temp(zone.read())
+    except (OSError, ValueError):
+        return None
+
+
+def temp_color(temp):
+    for limit, color in TEMP_COLORS:
+        if limit is None or temp < limit:
+            return color
+
+
+class SystemMonitor:
+    def __init__(self, root='/'):
+        self._stat = ProcFile(os.path.join(root, 'proc/stat'))
+        self._loadavg = ProcFile(os.path.join(root, 'proc/loadavg'), size=128)
+        self._temps = []
+        self._cpu_count = os.cpu_count() or 1
+        self._last_cpu = None
+
+        thermal = os.path.join(root, 'sys/class/thermal')
+        if os.path.isdir(thermal):
+            for zone in sorted(os.listdir(thermal)):
+                path = os.path.join(thermal, zone, 'temp')
+                if not zone.startswith('thermal_zone') or not os.path.exists(path):
+                    continue
+                try:
+                    temp_file = ProcFile(path, size=32)
+                except OSError:
+                    continue
+                if read_temp(temp_file) is None:
+                    temp_file.close()
+                    continue
+                self._temps.append(temp_file)
+
+    def sample(self):
+        total, idle = parse_cpu_times(self._stat.read())
+        cpu = 0.0
+        if self._last_cpu:
+            d_total = total - self._last_cpu[0]
+            d_idle = idle - self._last_cpu[1]
+            if d_total > 0:
+                cpu = 1.0 - d_idle / d_total
+        self._last_cpu = (total, idle)
+
+        load = parse_loadavg(self._loadavg.read()) / self._cpu_count
+        temps = [t for t in (read_temp(f) for f in self._temps) if t is not None]
+        temp = max(temps, default=None)
+        return cpu, load, temp
+
+    def close(self):
+        for f in [self._stat, self._loadavg] + self._temps:
+            f.close()
+
+
+def _cells(fraction):
+    return max(0, min(BAR_CELLS, int(round(fraction * BAR_CELLS))))
+
+
+def frame_key(cpu, load, temp):
+    return _cells(cpu), _cells(load), temp_color(temp) if temp is not None else None
+
+
+def render_frame(key):
+    cpu_cells, load_cells, heat = key
+    rows = [bytearray(BAR_CELLS * 4) for _ in range(8)]
+    cpu_row = get_bar_color_vector(CPU_COLOR, cpu_cells)
+    load_row = get_bar_color_vector(LOAD_COLOR, load_cells)
+    for i in CPU_ROWS:
+        rows[i] = cpu_row
+    for i in LOAD_ROWS:
+        rows[i] = load_row
+    if heat:
+        heat_row = get_mono_color_vector(heat)
+        for i in TEMP_ROWS:
+            rows[i] = heat_row
+    return rows
+
+
+def run_monitor(keyboard, root='/', rate=SAMPLE_RATE, out=print):
+    monitor = SystemMonitor(root)
+    interval = 1.0 / rate
+    last_key = None
+    samples = 0
+    updates = 0
+    sample_time = 0.0
+    start_wall = time.monotonic()
+    start_cpu = time.process_time()
+    next_tick = start_wall
+
+    try:
+        while True:
+            t0 = time.perf_counter()
+            key = frame_key(*monitor.sample())
+            sample_time += time.perf_counter() - t0
+            samples += 1
+
+            if key != last_key:
+                keyboard.set_rows(render_frame(key), save=0x00)
+                last_key = key
+                updates += 1
+
+            next_tick += interval
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.monotonic()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        monitor.close()
+
+    wall = time.monotonic() - start_wall
+    cpu = time.process_time() - start_cpu
+    if samples:
+        out(f"Samples: {samples}, updates pushed: {updates}")
+        out(f"Avg sample time: {sample_time / samples * 1e6:.1f} µs")
+        out(f"Monitor CPU usage: {cpu / wall * 100 if wall else 0:.2f}%")
+    return samples, updates
@@ -0,0 +1,276 @@
+# ------------------------------------------------------------------------------
+# XMG-KB - RGB Keyboard Controller
+# Version: 2.1.1
+# Author: Gerald Hasani
+# Email: contact@gerald-hasani.com
+# GitHub: https://github.com/Gerald-Ha
+# ------------------------------------------------------------------------------
+
+# Minimal OpenRGB SDK server: exposes the keyboard as one controller with a
+# single matrix zone so OpenRGB clients can stream per-key colors into it.
+
+import selectors
+import socket
+import struct
+import time
+
+from xmg.core.patterns import KEY_ROWS, KEY_COLS, ROW_BYTES, FRAME_BYTES
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 6742
+DEFAULT_FPS = 60
+
+PROTOCOL_VERSION = 1
+HEADER = struct.Struct('<4sIII')
+MAGIC = b'ORGB'
+
+REQUEST_CONTROLLER_COUNT = 0
+REQUEST_CONTROLLER_DATA = 1
+REQUEST_PROTOCOL_VERSION = 40
+SET_CLIENT_NAME = 50
+RGBCONTROLLER_RESIZEZONE = 1000
+RGBCONTROLLER_UPDATELEDS = 1050
+RGBCONTROLLER_UPDATEZONELEDS = 1051
+RGBCONTROLLER_UPDATESINGLELED = 1052
+RGBCONTROLLER_SETCUSTOMMODE = 1100
+RGBCONTROLLER_UPDATEMODE = 1101
+
+DEVICE_TYPE_KEYBOARD = 5
+ZONE_TYPE_MATRIX = 2
+MODE_FLAG_HAS_PER_LED_COLOR = 1 << 5
+MODE_COLORS_PER_LED = 1
+
+LED_COUNT = KEY_ROWS * KEY_COLS
+# Largest valid request is UpdateLEDs (6 + LED_COUNT * 4 bytes); anything far
+# beyond that is a broken or hostile client
+MAX_PACKET = 64 * 1024
+ZERO_PADS = bytes(LED_COUNT)
+
+
+def _string(value):
+    data = value.encode() + b'\x00'
+    return struct.pack('<H', len(data)) + data
+
+
+def build_controller_data(protocol):
+    body = struct.pack('<i', DEVICE_TYPE_KEYBOARD)
+    body += _string('XMG Keyboard')
+    if protocol >= 1:
+        body += _string('XMG')
+    body += _string('ITE 8291 RGB keyboard (xmg-kb)')
+    body += _string('2.1.1')
+    body += _string('')
+    body += _string('USB 048d:600b')
+
+    body += struct.pack('<Hi', 1, 0)
+    body += _string('Direct')
+    body += struct.pack('<iIIIIIIIIH', 0, MODE_FLAG_HAS_PER_LED_COLOR,
+                        0, 0, 0, 0, 0, 0, MODE_COLORS_PER_LED, 0)
+
+    matrix = struct.pack('<II', KEY_ROWS, KEY_COLS)
+    matrix += struct.pack(f'<{LED_COUNT}I', *range(LED_COUNT))
+    body += struct.pack('<H', 1)
+    body += _string('Keyboard')
+    body += struct.pack('<iIIIH', ZONE_TYPE_MATRIX, LED_COUNT, LED_COUNT, LED_COUNT, len(matrix))
+    body += matrix
+
+    body += struct.pack('<H', LED_COUNT)
+    for r in range(KEY_ROWS):
+        for c in range(KEY_COLS):
+            body += _string(f'Key R{r + 1}C{c + 1}')
+            body += struct.pack('<I', r * KEY_COLS + c)
+
+    body += struct.pack('<H', LED_COUNT) + bytes(LED_COUNT * 4)
+    return struct.pack('<I', len(body) + 4) + body
+
+
+class FrameBuffer:
+    # OpenRGB colors are R,G,B,pad; the keyboard wants pad,R,G,B. Copying the
+    # wire bytes shifted by one lines them up, then the pad bytes are cleared.
+    def __init__(self):
+        self.frame = bytearray(FRAME_BYTES)
+        self.dirty = False
+        self.received = 0
+
+    def update(self, colors, start=0):
+        count = min(len(colors) // 4, LED_COUNT - start)
+        if count <= 0:
+            return
+        offset = start * 4
+        self.frame[offset + 1:offset + count * 4] = colors[:count * 4 - 1]
+        self.frame[offset:offset + count * 4:4] = ZERO_PADS[:count]
+        self.dirty = True
+        self.received += 1
+
+    def rows(self):
+        return [self.frame[i:i + ROW_BYTES] for i in range(0, FRAME_BYTES, ROW_BYTES)]
+
+
+class Client:
+    def __init__(self, sock):
+        self.sock = sock
+        self.buffer = bytearray()
+        self.outgoing = bytearray()
+        self.events = selectors.EVENT_READ
+        self.closed = False
+        self.name = ''
+
+    def send(self, dev_idx, pkt_id, data):
+        # Queued; the server flushes it without blocking on slow readers
+        self.outgoing += HEADER.pack(MAGIC, dev_idx, pkt_id, len(data)) + data
+
+
+class OpenRGBServer:
+    def __init__(self, keyboard, host=DEFAULT_HOST, port=DEFAULT_PORT, fps=DEFAULT_FPS):
+        self._keyboard = keyboard
+        self._address = (host, port)
+        self._interval = 1.0 / fps
+        self._selector = selectors.DefaultSelector()
+        self._listener = None
+        self._running = False
+        self.frames = FrameBuffer()
+        self.pushed = 0
+
+    def _accept(self, listener):
+        sock, _ = listener.accept()
+        sock.setblocking(False)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._selector.register(sock, selectors.EVENT_READ, Client(sock))
+
+    def _drop(self, client):
+        if client.closed:
+            return
+        client.closed = True
+        self._selector.unregister(client.sock)
+        client.sock.close()
+
+    def _flush(self, client):
+        if client.outgoing:
+            try:
+                sent = client.sock.send(client.outgoing)
+                del client.outgoing[:sent]
+            except (BlockingIOError, InterruptedError):
+                pass
+            except OSError:
+                self._drop(client)
+                return
+
+        events = selectors.EVENT_READ
+        if client.outgoing:
+            events |= selectors.EVENT_WRITE
+        if events != client.events:
+            client.events = events
+            self._selector.modify(client.sock, events, client)
+
+    def _read(self, client):
+        try:
+            data = client.sock.recv(65536)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            data = b''
+        if not data:
+            self._drop(client)
+            return
+
+        buffer = client.buffer
+        buffer += data
+        consumed = 0
+        with memoryview(buffer) as view:
+            while len(buffer) - consumed >= HEADER.size:
+                magic, dev_idx, pkt_id, size = HEADER.unpack_from(buffer, consumed)
+                if magic != MAGIC or size > MAX_PACKET:
+                    self._drop(client)
+                    return
+                end = consumed + HEADER.size + size
+                if end > len(buffer):
+                    break
+                self._handle(client, dev_idx, pkt_id, view[consumed + HEADER.size:end])
+                consumed = end
+        del buffer[:consumed]
+        self._flush(client)
+
+    def _handle(self, client, dev_idx, pkt_id, data):
+        if pkt_id >= RGBCONTROLLER_RESIZEZONE and dev_idx != 0:
+            return
+        if pkt_id == RGBCONTROLLER_UPDATELEDS:
+            if len(data) >= 6:
+                count, = struct.unpack_from('<H', data, 4)
+                self.frames.update(data[6:6 + count * 4])
+        elif pkt_id == RGBCONTROLLER_UPDATEZONELEDS:
+            if len(data) >= 10:
+                zone, count = struct.unpack_from('<IH', data, 4)
+                if zone == 0:
+                    self.frames.update(data[10:10 + count * 4])
+        elif pkt_id == RGBCONTROLLER_UPDATESINGLELED:
+            if len(data) >= 8:
+                led, = struct.unpack_from('<i', data, 0)
+                if 0 <= led < LED_COUNT:
+                    self.frames.update(data[4:8], start=led)
+        elif pkt_id == REQUEST_CONTROLLER_COUNT:
+            client.send(0, pkt_id, struct.pack('<I', 1))
+        elif pkt_id == REQUEST_CONTROLLER_DATA:
+            protocol = struct.unpack_from('<I', data)[0] if len(data) >= 4 else 0
+            client.send(dev_idx, pkt_id, build_controller_data(min(protocol, PROTOCOL_VERSION)))
+        elif pkt_id == REQUEST_PROTOCOL_VERSION:
+            client.send(0, pkt_id, struct.pack('<I', PROTOCOL_VERSION))
+        elif pkt_id == SET_CLIENT_NAME:
+            client.name = bytes(data).rstrip(b'\x00').decode(errors='replace')
+        # Resize zone / mode changes don't apply to a fixed matrix in direct mode
+
+    def _push(self):
+        if self.frames.dirty:
+            self.frames.dirty = False
+            self._keyboard.set_rows(self.frames.rows(), save=0x00)
+            self.pushed += 1
+
+    def serve_forever(self, out=print):
+        self._listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._listener.bind(self._address)
+        self._listener.listen()
+        self._listener.setblocking(False)
+        self._selector.register(self._listener, selectors.EVENT_READ, None)
+
+        start = time.monotonic()
+        next_tick = start + self._interval
+        self._running = True
+        try:
+            while self._running:
+                timeout = max(0.0, next_tick - time.monotonic())
+                for key, mask in self._selector.select(timeout):
+                    client = key.data
+                    if client is None:
+                        self._accept(key.fileobj)
+                        continue
+                    if mask & selectors.EVENT_WRITE:
+                        self._flush(client)
+                    if mask & selectors.EVENT_READ and not client.closed:
+                        self._read(client)
+
+                now = time.monotonic()
+                if now >= next_tick:
+                    self._push()
+                    next_tick += self._interval
+                    if next_tick < now:
+                        next_tick = now + self._interval
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+        elapsed = time.monotonic() - start
+        if elapsed > 0:
+            out(f"Frames received: {self.frames.received}, pushed: {self.pushed}")
+            out(f"Received: {self.frames.received / elapsed:.1f} fps, "
+                f"pushed: {self.pushed / elapsed:.1f} fps")
+        return self.frames.received, self.pushed
+
+    def stop(self):
+        self._running = False
+
+    def close(self):
+        for key in list(self._selector.get_map().values()):
+            self._selector.unregister(key.fileobj)
+            key.fileobj.close()
+        self._selector.close()
@@ -0,0 +1,235 @@
+# ------------------------------------------------------------------------------
+# XMG-KB - RGB Keyboard Controller
+# Version: 2.1.1
+# Author: Gerald Hasani
+# Email: contact@gerald-hasani.com
+# GitHub: https://github.com/Gerald-Ha
+# ------------------------------------------------------------------------------
+
+# Pattern syntax: one or more layers joined with '+', drawn in order.
+#
+#   solid:red                 all keys one color
+#   split:red,blue            each row split into equal blocks (left → right)
+#   gradient:red,blue         horizontal gradient through all given colors
+#   vgradient:red,blue        vertical gradient (top → bottom)
+#   rows:red,green,blue       one color per row, repeated
+#   cols:red,green,blue       one color per column, repeated (key by key)
+#   stripes:pink,cyan         alias for cols
+#   fill:red@2:0-3            key range: row(s) @ column(s), N, N-M or *
+#
+# Colors are names from COLORS or #rrggbb.
+
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+
+from xmg.core.colors import COLORS
+
+KEY_ROWS = 8
+KEY_COLS = 16
+ROW_BYTES = KEY_COLS * 4
+FRAME_BYTES = KEY_ROWS * ROW_BYTES
+
+# Bump whenever compile_pattern() output changes so cached payloads are rebuilt
+CACHE_VERSION = 1
+CACHE_MAGIC = b'XKBP' + bytes([CACHE_VERSION])
+CACHE_MAX_FILES = 64
+
+PATTERN_ALIASES = {
+    'stripes': 'cols',
+}
+
+PRESET_PATTERNS = {
+    'h-pink-cyan': 'cols:pink,cyan',
+    'v-red-blue':  'split:red,blue',
+}
+
+
+def _parse_color(token):
+    if not token:
+        raise ValueError("Empty color in pattern")
+    if token.startswith('#') and len(token) == 7:
+        try:
+            return [0x00, int(token[1:3], 16), int(token[3:5], 16), int(token[5:7], 16)]
+        except ValueError:
+            pass
+    elif token in COLORS and token not in PRESET_PATTERNS:
+        return COLORS[token]
+    raise ValueError(f"Unknown color in pattern: {token}")
+
+
+def _parse_span(token, size):
+    if token == '*':
+        return 0, size - 1
+    start, _, end = token.partition('-')
+    if not start.isdigit() or (end and not end.isdigit()):
+        raise ValueError(f"Invalid key range in pattern: {token}")
+    first = int(start)
+    last = int(end) if end else first
+    if not 0 <= first <= last < size:
+        raise ValueError(f"Key range out of bounds in pattern: {token}")
+    return first, last
+
+
+def _lerp(stops, pos):
+    if len(stops) == 1:
+        return stops[0]
+    scaled = pos * (len(stops) - 1)
+    i = min(int(scaled), len(stops) - 2)
+    t = scaled - i
+    a, b = stops[i], stops[i + 1]
+    return [0x00] + [int(round(a[c] + (b[c] - a[c]) * t)) for c in (1, 2, 3)]
+
+
+def _gradient(colors, size):
+    return [_lerp(colors, i / (size - 1)) for i in range(size)]
+
+
+def normalize_pattern(pattern):
+    pattern = PRESET_PATTERNS.get(pattern.strip().lower(), pattern)
+    layers = []
+    for layer in pattern.lower().split('+'):
+        kind, sep, arg = ''.join(layer.split()).partition(':')
+        if not sep or not arg:
+            raise ValueError(f"Invalid pattern layer: {layer.strip()}")
+        layers.append(f"{PATTERN_ALIASES.get(kind, kind)}:{arg}")
+    return '+'.join(layers)
+
+
+def _draw_layer(frame, kind, arg):
+    if kind == 'fill':
+        color, _, where = arg.partition('@')
+        rows, _, cols = where.partition(':')
+        if not rows or not cols:
+            raise ValueError(f"fill needs color@rows:cols, got: {arg}")
+        value = _parse_color(color)
+        r0, r1 = _parse_span(rows, KEY_ROWS)
+        c0, c1 = _parse_span(cols, KEY_COLS)
+        for r in range(r0, r1 + 1):
+            for c in range(c0, c1 + 1):
+                frame[r][c] = value
+        return
+
+    colors = [_parse_color(c) for c in arg.split(',')]
+
+    if kind == 'solid':
+        line = [colors[0]] * KEY_COLS
+    elif kind == 'cols':
+        line = [colors[c % len(colors)] for c in range(KEY_COLS)]
+    elif kind == 'split':
+        block = KEY_COLS // len(colors) or 1
+        line = [colors[min(c // block, len(colors) - 1)] for c in range(KEY_COLS)]
+    elif kind == 'gradient':
+        line = _gradient(colors, KEY_COLS)
+    elif kind == 'rows':
+        for r in range(KEY_ROWS):
+            frame[r] = [colors[r % len(colors)]] * KEY_COLS
+        return
+    elif kind == 'vgradient':
+        for r, value in enumerate(_gradient(colors, KEY_ROWS)):
+            frame[r] = [value] * KEY_COLS
+        return
+    else:
+        raise ValueError(f"Unknown pattern type: {kind}")
+
+    for r in range(KEY_ROWS):
+        frame[r] = list(line)
+
+
+def compile_pattern(pattern):
+    frame = [[[0x00, 0x00, 0x00, 0x00]] * KEY_COLS for _ in range(KEY_ROWS)]
+    for layer in normalize_pattern(pattern).split('+'):
+        kind, _, arg = layer.partition(':')
+        _draw_layer(frame, kind, arg)
+    return bytes(b for row in frame for cell in row for b in cell)
+
+
+def _colors_digest():
+    return hashlib.sha1(json.dumps(COLORS, sort_keys=True).encode()).hexdigest()
+
+
+class PatternCache:
+    def __init__(self, cache_dir=None, maxsize=32, max_files=CACHE_MAX_FILES):
+        self._cache_dir = cache_dir
+        self._maxsize = maxsize
+        self._max_files = max_files
+        self._entries = OrderedDict()
+        self._salt = f"{CACHE_VERSION}:{_colors_digest()}:"
+
+    def _path(self, key):
+        digest = hashlib.sha1((self._salt + key).encode()).hexdigest()
+        return os.path.join(self._cache_dir, f"{digest}.bin")
+
+    def _load(self, key):
+        if not self._cache_dir:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            if data[:len(CACHE_MAGIC)] == CACHE_MAGIC and len(data) == len(CACHE_MAGIC) + FRAME_BYTES:
+                os.utime(path)
+                return data[len(CACHE_MAGIC):]
+        except OSError:
+            pass
+        return None
+
+    def _store(self, key, payload):
+        if not self._cache_dir:
+            return
+        tmp_path = None
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self._cache_dir, prefix='.pattern.', suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(CACHE_MAGIC + payload)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, self._path(key))
+            tmp_path = None
+            self._prune()
+        except OSError:
+            pass
+        finally:
+            if tmp_path:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+
+    def _prune(self):
+        files = []
+        for name in os.listdir(self._cache_dir):
+            if name.endswith('.bin'):
+                path = os.path.join(self._cache_dir, name)
+                try:
+                    files.append((os.stat(path).st_mtime_ns, path))
+                except OSError:
+                    pass
+        files.sort()
+        for _, path in files[:max(0, len(files) - self._max_files)]:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+    def get(self, pattern):
+        key = normalize_pattern(pattern)
+        payload = self._entries.get(key)
+        if payload is not None:
+            self._entries.move_to_end(key)
+            return payload
+
+        payload = self._load(key)
+        if payload is None:
+            payload = compile_pattern(key)
+            self._store(key, payload)
+
+        self._entries[key] = payload
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+        return payload
+
+    def clear(self):
+        self._entries.clear()
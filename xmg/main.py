@@ -14,15 +14,24 @@ import re
 import json
 
 from xmg.core.handler import KeyboardController
+from xmg.core.config import ConfigStore, normalize_config
 from xmg.core.colors import (
     COLORS,
-    get_mono_color_vector,
-    get_h_alt_color_vector,
-    get_v_alt_color_vector
+    get_mono_color_vector
+)
+from xmg.core.effects import SOFTWARE_EFFECTS, create_effect, run_effect
+from xmg.core.monitor import run_monitor
+from xmg.core.openrgb import DEFAULT_PORT, OpenRGBServer
+from xmg.core.patterns import (
+    PRESET_PATTERNS,
+    ROW_BYTES,
+    PatternCache
 )
 
 CONFIG_DIR = "/etc/xmg-kb"
 CONFIG_FILE = f"{CONFIG_DIR}/config.json"
+CONFIG_STORE = ConfigStore(CONFIG_DIR, filename=os.path.basename(CONFIG_FILE))
+PATTERN_CACHE = PatternCache(f"{CONFIG_DIR}/patterns")
 
 BRIGHTNESS_LEVELS = {
     1: 0x08,
@@ -98,9 +107,7 @@ COLOR_TO_EFFECT_CODE = {
 
 def save_config(config):
     try:
-        os.makedirs(CONFIG_DIR, exist_ok=True)
-        with open(CONFIG_FILE, 'w') as f:
-            json.dump(config, f, indent=2)
+        CONFIG_STORE.save(config)
         return True
     except Exception as e:
         print(f"Error saving configuration: {e}")
@@ -109,19 +116,26 @@ def save_config(config):
 
 def load_config():
     try:
-        if os.path.exists(CONFIG_FILE):
-            with open(CONFIG_FILE, 'r') as f:
-                return json.load(f)
+        return CONFIG_STORE.load()
     except Exception as e:
         print(f"Error loading configuration: {e}")
     return None
 
 
+def _report_lock_wait():
+    print("Keyboard in use by another xmg-kb process (monitor/server/effect), waiting…")
+
+
+def keyboard_lock():
+    return CONFIG_STORE.device_lock(on_wait=_report_lock_wait)
+
+
 def apply_config(keyboard, config):
     if not config:
         return False
     
     try:
+        config = normalize_config(config)
         mode = config.get('mode', 'color')
         brightness = config.get('brightness', 4)
         
@@ -139,6 +153,9 @@ def apply_config(keyboard, config):
             colors = config.get('colors', ['red', 'blue'])
             keyboard.set_brightness(brightness)
             keyboard.set_v_colors(colors[0], colors[1])
+        elif mode == 'pattern':
+            keyboard.set_brightness(brightness)
+            keyboard.set_pattern(config.get('pattern', 'solid:white'))
         else:  # mode == 'color'
             color = config.get('color', 'white')
             keyboard.set_brightness(brightness)
@@ -221,16 +238,21 @@ class XMGKeyboard(KeyboardController):
         self.bulk_write(times=8, payload=get_mono_color_vector(color))
 
     def set_h_colors(self, color_a, color_b):
-        if not self._brightness:
-            self.set_brightness(4)
-        self._prepare_color_change()
-        self.bulk_write(times=8, payload=get_h_alt_color_vector(color_a, color_b))
+        self.set_pattern(f"cols:{color_a},{color_b}")
 
     def set_v_colors(self, color_a, color_b):
+        self.set_pattern(f"split:{color_a},{color_b}")
+
+    def set_pattern(self, pattern):
+        payload = PATTERN_CACHE.get(pattern)
+        self.set_rows([payload[i:i + ROW_BYTES] for i in range(0, len(payload), ROW_BYTES)])
+
+    def set_rows(self, rows, save=0x01):
         if not self._brightness:
             self.set_brightness(4)
-        self._prepare_color_change()
-        self.bulk_write(times=8, payload=get_v_alt_color_vector(color_a, color_b))
+        self._prepare_color_change(save=save)
+        for row in rows:
+            self.bulk_write(payload=row)
 
 
 def run_auto_test(keyboard):
@@ -315,7 +337,8 @@ def show_menu(keyboard):
             return None
         
         if choice == 'off' or (choice.isdigit() and int(choice) == off_num):
-            keyboard.turn_off()
+            with keyboard_lock():
+                keyboard.turn_off()
             print(f"{Term.GREEN}✓ Keyboard backlight turned off{Term.RESET}\n")
             return {'mode': 'off'}
         
@@ -337,8 +360,9 @@ def show_menu(keyboard):
         
         print(f"{Term.GREEN}   ✓ Color: {selected_color}{Term.RESET}")
         
-        if selected_color == 'h-pink-cyan':
-            print(f"\n{Term.YELLOW}⚠ Special combo - horizontal pink/cyan{Term.RESET}")
+        if selected_color in PRESET_PATTERNS:
+            pattern = PRESET_PATTERNS[selected_color]
+            print(f"\n{Term.YELLOW}⚠ Special combo - pattern '{pattern}'{Term.RESET}")
             
             print(f"\n{Term.YELLOW}{'═' * 64}{Term.RESET}")
             print(f"{Term.YELLOW}  Choose brightness{Term.RESET}")
@@ -351,33 +375,12 @@ def show_menu(keyboard):
             print(f"{Term.GREEN}   ✓ Brightness: {brightness}{Term.RESET}")
             
             print(f"\n{Term.DIM}{'─' * 64}{Term.RESET}")
-            keyboard.set_brightness(brightness)
-            keyboard.set_h_colors('pink', 'cyan')
-            config = {'mode': 'h-alt', 'color_a': 'pink', 'color_b': 'cyan', 'brightness': brightness}
-            save_config(config)
-            print(f"{Term.GREEN}{Term.BOLD}✓ Done!{Term.RESET} Horizontal pink/cyan with brightness {brightness}")
-            print(f"{Term.DIM}💾 Settings saved (will be restored on reboot){Term.RESET}\n")
-            return config
-        
-        elif selected_color == 'v-red-blue':
-            print(f"\n{Term.YELLOW}⚠ Special combo - vertical red/blue{Term.RESET}")
-            
-            print(f"\n{Term.YELLOW}{'═' * 64}{Term.RESET}")
-            print(f"{Term.YELLOW}  Choose brightness{Term.RESET}")
-            print(f"{Term.YELLOW}{'═' * 64}{Term.RESET}")
-            print(f"   1 = dark  │  2 = low  │  3 = medium  │  4 = bright")
-            
-            brightness_input = input(f"\n{Term.CYAN}➤ Brightness (1-4, Enter = 4): {Term.RESET}").strip()
-            brightness = int(brightness_input) if brightness_input.isdigit() else 4
-            brightness = max(1, min(4, brightness))
-            print(f"{Term.GREEN}   ✓ Brightness: {brightness}{Term.RESET}")
-            
-            print(f"\n{Term.DIM}{'─' * 64}{Term.RESET}")
-            keyboard.set_brightness(brightness)
-            keyboard.set_v_colors('red', 'blue')
-            config = {'mode': 'v-alt', 'color_a': 'red', 'color_b': 'blue', 'brightness': brightness}
-            save_config(config)
-            print(f"{Term.GREEN}{Term.BOLD}✓ Done!{Term.RESET} Vertical red/blue with brightness {brightness}")
+            config = {'mode': 'pattern', 'pattern': pattern, 'brightness': brightness}
+            with keyboard_lock():
+                keyboard.set_brightness(brightness)
+                keyboard.set_pattern(pattern)
+                save_config(config)
+            print(f"{Term.GREEN}{Term.BOLD}✓ Done!{Term.RESET} Pattern '{selected_color}' with brightness {brightness}")
             print(f"{Term.DIM}💾 Settings saved (will be restored on reboot){Term.RESET}\n")
             return config
         
@@ -455,11 +458,9 @@ def show_menu(keyboard):
         config = {'brightness': brightness}
         
         if selected_effect is None:
-            keyboard.set_brightness(brightness)
-            keyboard.set_color(selected_color)
             config['mode'] = 'color'
             config['color'] = selected_color
-            print(f"{Term.GREEN}{Term.BOLD}✓ Done!{Term.RESET} Color '{selected_color}' set with brightness {brightness}\n")
+            done = f"Color '{selected_color}' set with brightness {brightness}"
         else:
             if selected_effect in EFFECTS_WITH_COLORS:
                 effect_code = COLOR_TO_EFFECT_CODE.get(selected_color, '')
@@ -472,14 +473,23 @@ def show_menu(keyboard):
                 full_effect = selected_effect
                 color_info = ""
             
-            keyboard.set_effect(full_effect, brightness, speed)
             config['mode'] = 'effect'
             config['effect'] = full_effect
             config['speed'] = speed
-            print(f"{Term.GREEN}{Term.BOLD}✓ Done!{Term.RESET} Effect '{selected_effect}'{color_info} with brightness {brightness}, speed {speed}\n")
+            done = f"Effect '{selected_effect}'{color_info} with brightness {brightness}, speed {speed}"
         
-        # Save settings
-        if save_config(config):
+        # Apply and save under the same lock so a concurrent restore can't
+        # re-apply the old config on top of this one
+        with keyboard_lock():
+            if selected_effect is None:
+                keyboard.set_brightness(brightness)
+                keyboard.set_color(selected_color)
+            else:
+                keyboard.set_effect(full_effect, brightness, speed)
+            saved = save_config(config)
+        
+        print(f"{Term.GREEN}{Term.BOLD}✓ Done!{Term.RESET} {done}\n")
+        if saved:
             print(f"{Term.DIM}💾 Settings saved (will be restored on reboot){Term.RESET}\n")
         
         return config
@@ -520,7 +530,11 @@ def main():
                         help='Brightness (1-4)')
     parser.add_argument('-H', '--h-alt', nargs=2, help='Horizontally alternating colors')
     parser.add_argument('-V', '--v-alt', nargs=2, help='Vertically alternating colors')
+    parser.add_argument('-p', '--pattern',
+                        help="Color pattern, e.g. 'gradient:red,blue' or 'rows:red,white'")
     parser.add_argument('-s', '--style', help='Activate light effect')
+    parser.add_argument('--soft', choices=list(SOFTWARE_EFFECTS.keys()),
+                        help='Run a software-rendered effect (use with -c and --speed)')
     parser.add_argument('-d', '--disable', action='store_true', help='Turn off backlight')
     parser.add_argument('--speed', type=int, choices=range(1, 11),
                         help='Effect speed (1=fast, 10=slow)')
@@ -528,6 +542,12 @@ def main():
                         help='Restore last saved settings (for autostart)')
     parser.add_argument('--status', action='store_true',
                         help='Show currently saved configuration')
+    parser.add_argument('--monitor', action='store_true',
+                        help='Show CPU, load and temperature bars on the keyboard')
+    parser.add_argument('--serve', action='store_true',
+                        help='Run an OpenRGB SDK server on localhost')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                        help=f'Port for --serve (default {DEFAULT_PORT})')
     
     args = parser.parse_args()
     
@@ -539,6 +559,20 @@ def main():
             print("No configuration saved.")
         return
     
+    if args.pattern:
+        try:
+            PATTERN_CACHE.get(args.pattern)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+    
+    if args.soft:
+        try:
+            effect = create_effect(args.soft, color=args.color, speed=args.speed or 5)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+    
     try:
         keyboard = XMGKeyboard()
     except Exception as e:
@@ -546,14 +580,42 @@ def main():
         sys.exit(1)
     
     if args.restore:
-        config = load_config()
-        if config:
-            if apply_config(keyboard, config):
-                print("Configuration restored.")
+        with CONFIG_STORE.device_lock(blocking=False) as acquired:
+            if not acquired:
+                # Another xmg-kb process owns the keyboard (CLI, menu, monitor, server)
+                print("Keyboard busy, skipping restore.")
+                return
+            config = load_config()
+            if config:
+                if apply_config(keyboard, config):
+                    print("Configuration restored.")
+                else:
+                    print("Error restoring configuration.")
             else:
-                print("Error restoring configuration.")
-        else:
-            print("No saved configuration found.")
+                print("No saved configuration found.")
+        return
+    
+    # Streaming modes own the keyboard for their whole run, so the refresh
+    # timer's --restore skips instead of overwriting their frames
+    if args.monitor:
+        with keyboard_lock():
+            keyboard.set_brightness(args.brightness or 4)
+            print("System monitor running (Ctrl+C to stop)...")
+            run_monitor(keyboard)
+        return
+    
+    if args.soft:
+        with keyboard_lock():
+            keyboard.set_brightness(args.brightness or 4)
+            print(f"Software effect '{args.soft}' running (Ctrl+C to stop)...")
+            run_effect(keyboard, effect)
+        return
+    
+    if args.serve:
+        with keyboard_lock():
+            keyboard.set_brightness(args.brightness or 4)
+            print(f"OpenRGB server listening on 127.0.0.1:{args.port} (Ctrl+C to stop)...")
+            OpenRGBServer(keyboard, port=args.port).serve_forever()
         return
     
     if len(sys.argv) == 1:
@@ -562,34 +624,38 @@ def main():
     
     config = {}
     
-    if args.disable:
-        keyboard.turn_off()
-        config = {'mode': 'off'}
-    elif args.style:
-        speed = args.speed or 5
-        brightness = args.brightness or 3
-        keyboard.set_effect(args.style, brightness, speed=speed)
-        config = {'mode': 'effect', 'effect': args.style, 'brightness': brightness, 'speed': speed}
-    else:
-        brightness = args.brightness or 4
-        if args.brightness:
-            keyboard.set_brightness(args.brightness)
-        
-        if args.color:
-            keyboard.set_color(args.color)
-            config = {'mode': 'color', 'color': args.color, 'brightness': brightness}
-        elif args.h_alt:
-            keyboard.set_h_colors(*args.h_alt)
-            config = {'mode': 'h_alt', 'colors': args.h_alt, 'brightness': brightness}
-        elif args.v_alt:
-            keyboard.set_v_colors(*args.v_alt)
-            config = {'mode': 'v_alt', 'colors': args.v_alt, 'brightness': brightness}
+    with keyboard_lock():
+        if args.disable:
+            keyboard.turn_off()
+            config = {'mode': 'off'}
+        elif args.style:
+            speed = args.speed or 5
+            brightness = args.brightness or 3
+            keyboard.set_effect(args.style, brightness, speed=speed)
+            config = {'mode': 'effect', 'effect': args.style, 'brightness': brightness, 'speed': speed}
         else:
-            print("Run 'xmg-kb' without arguments for the interactive menu.")
-            return
-    
-    if config:
-        save_config(config)
+            brightness = args.brightness or 4
+            if args.brightness:
+                keyboard.set_brightness(args.brightness)
+            
+            if args.color:
+                keyboard.set_color(args.color)
+                config = {'mode': 'color', 'color': args.color, 'brightness': brightness}
+            elif args.h_alt:
+                keyboard.set_h_colors(*args.h_alt)
+                config = {'mode': 'h_alt', 'colors': args.h_alt, 'brightness': brightness}
+            elif args.v_alt:
+                keyboard.set_v_colors(*args.v_alt)
+                config = {'mode': 'v_alt', 'colors': args.v_alt, 'brightness': brightness}
+            elif args.pattern:
+                keyboard.set_pattern(args.pattern)
+                config = {'mode': 'pattern', 'pattern': args.pattern, 'brightness': brightness}
+            else:
+                print("Run 'xmg-kb' without arguments for the interactive menu.")
+                return
+        
+        if config:
+            save_config(config)
 
 
 if __name__ == "__main__":